@@ -1,10 +1,11 @@
 import os
 import re
 import sys
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from openpyxl import load_workbook
 
 DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "docs")
@@ -15,6 +16,24 @@ ROSTERS_XLSX = os.path.join(APP_DIR, "rosters.xlsx")
 OUT_PLAYER = os.path.join(DOCS_DIR, "Player_Pooh_Summary.html")
 OUT_BY_TEAM = os.path.join(DOCS_DIR, "Pooh_Summary_By_Team.html")
 
+_RE_CAP_PD = re.compile(r"PD(\d+)")
+_RE_PD_FILENAME = re.compile(r"Final_Players_PD(\d+)\.html$")
+_RE_PUNCT = re.compile(r"[^\w\s]")
+_NAME_SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv"))
+
+
+class _PunctTable(dict):
+    # str.translate table sending every [^\w\s] char to a space; filled per code point on first use
+    def __missing__(self, cp):
+        v = self[cp] = 0x20 if _RE_PUNCT.match(chr(cp)) else cp
+        return v
+
+
+_PUNCT_TABLE = _PunctTable()
+
+# Final_Players columns without which a file contributes nothing.
+_REQUIRED_COLS = frozenset(("player", "pooh"))
+
 # ----------------------------
 # Helpers
 # ----------------------------
@@ -23,61 +42,63 @@ def parse_cap_pd(argv) -> Optional[int]:
     if len(argv) < 2:
         return None
     s = argv[1].strip().upper()
-    m = re.fullmatch(r"PD(\d+)", s)
+    m = _RE_CAP_PD.fullmatch(s)
     if not m:
         raise SystemExit("Usage: python app/build_player_pooh_summary.py [PD7]")
     return int(m.group(1))
 
 def pd_num_from_filename(fn: str) -> Optional[int]:
-    m = re.search(r"Final_Players_PD(\d+)\.html$", fn)
+    m = _RE_PD_FILENAME.search(fn)
     return int(m.group(1)) if m else None
 
+@lru_cache(maxsize=8192)
 def norm_name(name: str) -> str:
-    s = (name or "").lower()
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\b(jr|sr|ii|iii|iv)\b", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    # After punctuation -> space the string is only word runs and whitespace,
+    # so \b-delimited suffixes are exactly whole tokens.
+    s = (name or "").lower().translate(_PUNCT_TABLE)
+    return " ".join(t for t in s.split() if t not in _NAME_SUFFIXES)
 
 def safe_int(x) -> int:
+    t = type(x)
+    if t is int:
+        return x
     try:
-        return int(str(x).strip())
+        if t is float:
+            return int(x)
+        return int((x if t is str else str(x)).strip())
     except:
         return 0
 
 def safe_float(x) -> float:
+    t = type(x)
+    if t is float or t is int:
+        return float(x)
     try:
-        return float(str(x).strip())
+        return float((x if t is str else str(x)).strip())
     except:
         return 0.0
 
 def html_read_table(path: str) -> Tuple[List[str], List[List[str]]]:
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    table = soup.find("table")
-    if not table:
+    doc = lxml_html.parse(path, lxml_html.HTMLParser(encoding="utf-8")).getroot()
+    table = doc.find(".//table") if doc is not None else None
+    if table is None:
         return [], []
 
-    headers = [th.get_text(strip=True) for th in table.find_all("th")]
-    headers_l = [h.lower() for h in headers]
-
+    # One walk over the table's rows: <th> cells are headers, <td> rows after the first are data.
+    headers_l: List[str] = []
     rows = []
-    for tr in table.find_all("tr")[1:]:
-        tds = tr.find_all("td")
-        if not tds:
-            continue
-        rows.append([td.get_text(strip=True) for td in tds])
+    for i, tr in enumerate(table.iter("tr")):
+        tds = []
+        for el in tr:
+            if el.tag == "td":
+                tds.append(el.text_content().strip())
+            elif el.tag == "th":
+                headers_l.append(el.text_content().strip().lower())
+        if i and tds:
+            rows.append(tds)
 
     return headers_l, rows
 
-def idx(headers_l: List[str], *cands: str) -> Optional[int]:
-    for c in cands:
-        c = c.lower()
-        if c in headers_l:
-            return headers_l.index(c)
-    return None
-
 # ----------------------------
 # Load rosters.xlsx (bio fields)
 # ----------------------------
@@ -90,20 +111,22 @@ def load_rosters() -> Dict[str, dict]:
     if not os.path.exists(ROSTERS_XLSX):
         raise SystemExit(f"ERROR: Missing {ROSTERS_XLSX}")
 
-    wb = load_workbook(ROSTERS_XLSX, data_only=True)
+    wb = load_workbook(ROSTERS_XLSX, data_only=True, read_only=True)
     ws = wb.active
 
-    headers = [("" if c.value is None else str(c.value).strip()) for c in ws[1]]
+    header_row = next(ws.iter_rows(max_row=1, values_only=True), ())
+    headers = [("" if v is None else str(v).strip()) for v in header_row]
     headers_l = [h.lower() for h in headers]
 
     def col(*cands):
+        # zero-based index into each row tuple
         for c in cands:
             if c.lower() in headers_l:
-                return headers_l.index(c.lower()) + 1
+                return headers_l.index(c.lower())
         return None
 
     c_name = col("name", "player")
-    if not c_name:
+    if c_name is None:
         raise SystemExit("ERROR: rosters.xlsx must have a 'Name' column.")
 
     c_cost   = col("cost")
@@ -114,47 +137,113 @@ def load_rosters() -> Dict[str, dict]:
     c_class  = col("class")
     c_pos    = col("position")
 
+    def val(vals, c) -> str:
+        if c is None or vals[c] is None:
+            return ""
+        return str(vals[c]).strip()
+
+    # Data rows come back as value tuples padded/cut to the header width.
     out: Dict[str, dict] = {}
-    for r in range(2, ws.max_row + 1):
-        name = ws.cell(row=r, column=c_name).value
-        name = "" if name is None else str(name).strip()
+    for vals in ws.iter_rows(min_row=2, max_col=len(headers), values_only=True):
+        name = val(vals, c_name)
         if not name:
             continue
         key = norm_name(name)
 
         out[key] = {
             "Name": name,
-            "Cost": "" if c_cost is None else ("" if ws.cell(row=r, column=c_cost).value is None else str(ws.cell(row=r, column=c_cost).value).strip()),
-            "Team Name": "" if c_owner is None else ("" if ws.cell(row=r, column=c_owner).value is None else str(ws.cell(row=r, column=c_owner).value).strip()),
-            "Team": "" if c_team is None else ("" if ws.cell(row=r, column=c_team).value is None else str(ws.cell(row=r, column=c_team).value).strip()),
-            "Height": "" if c_height is None else ("" if ws.cell(row=r, column=c_height).value is None else str(ws.cell(row=r, column=c_height).value).strip()),
-            "Weight": "" if c_weight is None else ("" if ws.cell(row=r, column=c_weight).value is None else str(ws.cell(row=r, column=c_weight).value).strip()),
-            "Class": "" if c_class is None else ("" if ws.cell(row=r, column=c_class).value is None else str(ws.cell(row=r, column=c_class).value).strip()),
-            "Position": "" if c_pos is None else ("" if ws.cell(row=r, column=c_pos).value is None else str(ws.cell(row=r, column=c_pos).value).strip()),
+            "Cost": val(vals, c_cost),
+            "Team Name": val(vals, c_owner),
+            "Team": val(vals, c_team),
+            "Height": val(vals, c_height),
+            "Weight": val(vals, c_weight),
+            "Class": val(vals, c_class),
+            "Position": val(vals, c_pos),
         }
+    wb.close()
 
     return out
 
 # ----------------------------
 # Load Final_Players_PD*.html (pooh per PD + stat totals)
 # ----------------------------
-def load_final_player_data(cap_pd: Optional[int]):
+def read_final_players(path: str) -> List[Tuple[str, str, int, int, int, int, int, int, int, float]]:
+    """
+    Returns one tuple per player row of a Final_Players_PDx.html:
+      (owner, player, pooh, pts, reb, ast, stl, blk, to, min)
+    Missing stat columns read as 0; owner is "" when absent.
+    """
+    headers_l, rows = html_read_table(path)
+    if not headers_l or not rows:
+        return []
+
+    # header -> first column index
+    col: Dict[str, int] = {}
+    for i, h in enumerate(headers_l):
+        col.setdefault(h, i)
+
+    if not _REQUIRED_COLS.issubset(col):
+        return []
+
+    i_owner  = col.get("owner")
+    i_player = col["player"]
+    i_pooh   = col["pooh"]
+    i_min    = col.get("min")
+    i_stats  = tuple(col.get(c) for c in ("pts", "reb", "ast", "stl", "blk", "to"))
+
+    to_int = safe_int
+    to_float = safe_float
+
+    out = []
+    for r in rows:
+        n = len(r)
+        if i_player >= n:
+            continue
+        owner = r[i_owner].strip() if i_owner is not None and i_owner < n else ""
+        pooh = to_int(r[i_pooh]) if i_pooh < n else 0
+        pts, reb, ast, stl, blk, to = (to_int(r[i]) if i is not None and i < n else 0 for i in i_stats)
+        mins = to_float(r[i_min]) if i_min is not None and i_min < n else 0.0
+        out.append((owner, r[i_player], pooh, pts, reb, ast, stl, blk, to, mins))
+
+    return out
+
+class PlayerAgg:
+    """
+    Totals for one player across the included PDs.
+    pd[n] is the Pooh for PDn (index 0 unused).
     """
+    __slots__ = ("pd", "games", "min", "pts", "reb", "ast", "stl", "blk", "to")
+
+    def __init__(self, max_pd: int):
+        self.pd = [0] * (max_pd + 1)
+        self.games = 0
+        self.min = 0.0
+        self.pts = 0
+        self.reb = 0
+        self.ast = 0
+        self.stl = 0
+        self.blk = 0
+        self.to = 0
+
+def load_final_player_data(cap_pd: Optional[int], key_by_lower: Dict[str, str]):
+    """
+    key_by_lower maps a lowercased roster name to its norm_name key, so exact
+    (case-insensitive) roster matches skip the regex normalization.
+
     Returns:
       max_pd
-      pooh_by_player_pd[player_norm][pd] = pooh
-      agg_stats[player_norm] = totals across included PDs:
-         games, min, pts, reb, ast, stl, blk, to
+      agg[player_norm] = PlayerAgg (Pooh per PD + totals across included PDs)
       owner_by_player[player_norm] = owner (from Final files when available)
     """
     files = []
-    for fn in os.listdir(DOCS_DIR):
-        n = pd_num_from_filename(fn)
-        if n is None:
-            continue
-        if cap_pd is not None and n > cap_pd:
-            continue
-        files.append((n, fn))
+    with os.scandir(DOCS_DIR) as it:
+        for entry in it:
+            n = pd_num_from_filename(entry.name)
+            if n is None or not entry.is_file():
+                continue
+            if cap_pd is not None and n > cap_pd:
+                continue
+            files.append((n, entry.name))
     files.sort(key=lambda x: x[0])
 
     if not files:
@@ -162,101 +251,77 @@ def load_final_player_data(cap_pd: Optional[int]):
 
     max_pd = files[-1][0]
 
-    pooh_by_player_pd: Dict[str, Dict[int, int]] = defaultdict(dict)
-    agg = defaultdict(lambda: {"games": 0, "min": 0.0, "pts": 0, "reb": 0, "ast": 0, "stl": 0, "blk": 0, "to": 0})
+    agg: Dict[str, PlayerAgg] = {}
     owner_by_player: Dict[str, str] = {}
 
-    for pd, fn in files:
-        path = os.path.join(DOCS_DIR, fn)
-        headers_l, rows = html_read_table(path)
-        if not headers_l or not rows:
-            continue
-
-        i_owner  = idx(headers_l, "owner")
-        i_player = idx(headers_l, "player")
-        i_pooh   = idx(headers_l, "pooh")
-        i_pts    = idx(headers_l, "pts")
-        i_reb    = idx(headers_l, "reb")
-        i_ast    = idx(headers_l, "ast")
-        i_stl    = idx(headers_l, "stl")
-        i_blk    = idx(headers_l, "blk")
-        i_to     = idx(headers_l, "to")
-        i_min    = idx(headers_l, "min")
-
-        if i_player is None or i_pooh is None:
-            continue
+    # Files are independent: parse them in worker processes, aggregate here in PD order.
+    paths = [os.path.join(DOCS_DIR, fn) for _, fn in files]
+    with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as ex:
+        parsed = list(ex.map(read_final_players, paths))
 
-        for r in rows:
-            if i_player >= len(r):
-                continue
-            pname = r[i_player]
-            key = norm_name(pname)
+    for (pd, _), rows in zip(files, parsed):
+        for owner, pname, pooh, pts, reb, ast, stl, blk, to, mins in rows:
+            key = key_by_lower.get(pname.strip().lower()) or norm_name(pname)
             if not key:
                 continue
 
-            pooh = safe_int(r[i_pooh]) if i_pooh < len(r) else 0
-            pooh_by_player_pd[key][pd] = pooh
+            a = agg.get(key)
+            if a is None:
+                a = agg[key] = PlayerAgg(max_pd)
+
+            a.pd[pd] = pooh
 
             # Count as a game played for that PD.
-            agg[key]["games"] += 1
-            if i_min is not None and i_min < len(r):
-                agg[key]["min"] += safe_float(r[i_min])
-            if i_pts is not None and i_pts < len(r):
-                agg[key]["pts"] += safe_int(r[i_pts])
-            if i_reb is not None and i_reb < len(r):
-                agg[key]["reb"] += safe_int(r[i_reb])
-            if i_ast is not None and i_ast < len(r):
-                agg[key]["ast"] += safe_int(r[i_ast])
-            if i_stl is not None and i_stl < len(r):
-                agg[key]["stl"] += safe_int(r[i_stl])
-            if i_blk is not None and i_blk < len(r):
-                agg[key]["blk"] += safe_int(r[i_blk])
-            if i_to is not None and i_to < len(r):
-                agg[key]["to"] += safe_int(r[i_to])
-
-            if i_owner is not None and i_owner < len(r):
-                ow = r[i_owner].strip()
-                if ow:
-                    owner_by_player[key] = ow
-
-    return max_pd, pooh_by_player_pd, agg, owner_by_player
+            a.games += 1
+            a.min += mins
+            a.pts += pts
+            a.reb += reb
+            a.ast += ast
+            a.stl += stl
+            a.blk += blk
+            a.to += to
+
+            if owner:
+                owner_by_player[key] = owner
+
+    return max_pd, agg, owner_by_player
 
 # ----------------------------
 # Write HTML
 # ----------------------------
 NUM_COLS = {"Cost","Min/G","Avg","Total","PPG","R/G","A/G","B/G","S/G","T/G"}
 
+PAGE_STYLE = (
+    "<style>"
+    "body{font-family:Arial}"
+    "table{border-collapse:collapse;font-size:14px}"
+    "th,td{border:1px solid #ccc;padding:4px 6px}"
+    "th{background:#eee}"
+    "td.num{text-align:right}"
+    "</style>"
+)
+
 def write_html(out_path: str, cols: List[str], rows: List[Dict[str, str]], title: str):
-    with open(out_path, "w", encoding="utf-8") as out:
-        out.write("<!doctype html><html><head><meta charset='utf-8'>")
-        out.write(f"<title>{title}</title>")
-        out.write(
-            "<style>"
-            "body{font-family:Arial}"
-            "table{border-collapse:collapse;font-size:14px}"
-            "th,td{border:1px solid #ccc;padding:4px 6px}"
-            "th{background:#eee}"
-            "td.num{text-align:right}"
-            "</style>"
-        )
-        out.write("</head><body>")
-        out.write(f"<h2 style='text-align:center'>{title}</h2>")
-
-        out.write("<table><thead><tr>")
-        for c in cols:
-            out.write(f"<th>{c}</th>")
-        out.write("</tr></thead><tbody>")
-
-        for r in rows:
-            out.write("<tr>")
-            for c in cols:
-                v = r.get(c, "")
-                is_num = (c in NUM_COLS) or c.isdigit()
-                cls = " class='num'" if is_num else ""
-                out.write(f"<td{cls}>{v}</td>")
-            out.write("</tr>")
-
-        out.write("</tbody></table></body></html>")
+    parts: List[str] = []
+    append = parts.append
+    append(
+        f"<!doctype html><html><head><meta charset='utf-8'><title>{title}</title>{PAGE_STYLE}</head>"
+        f"<body><h2 style='text-align:center'>{title}</h2>"
+    )
+
+    append("<table><thead><tr>" + "".join(f"<th>{c}</th>" for c in cols) + "</tr></thead><tbody>")
+
+    # Column layout is fixed for the whole table: resolve each column's <td> tag once.
+    col_tags = [(c, "<td class='num'>" if (c in NUM_COLS) or c.isdigit() else "<td>") for c in cols]
+
+    for r in rows:
+        get = r.get
+        append("<tr>" + "".join(f"{td}{get(c, '')}</td>" for c, td in col_tags) + "</tr>")
+
+    append("</tbody></table></body></html>")
+
+    with open(out_path, "wb") as out:
+        out.write("".join(parts).encode("utf-8"))
 
     print(f"Wrote: {out_path}")
 
@@ -267,7 +332,8 @@ def main():
     cap_pd = parse_cap_pd(sys.argv)
 
     rosters = load_rosters()
-    max_pd, pooh_by_player_pd, agg, owner_by_player = load_final_player_data(cap_pd)
+    key_by_lower = {info["Name"].lower(): key for key, info in rosters.items()}
+    max_pd, agg, owner_by_player = load_final_player_data(cap_pd, key_by_lower)
 
     # Columns EXACTLY as you requested
     fixed_cols = ["Team Name","Cost","Name","Team","Height","Weight","Class","Position","Min/G","Avg","Total"]
@@ -276,27 +342,25 @@ def main():
     cols = fixed_cols + pd_cols + tail_cols
 
     rows_out: List[Dict[str, str]] = []
+    no_games = PlayerAgg(max_pd)
 
     # Build rows from roster list (keeps every rostered player even if they never played)
     for key, info in rosters.items():
+        g = agg.get(key, no_games)
+        games = g.games
+
         # Pooh per PD
-        pd_vals = [pooh_by_player_pd.get(key, {}).get(pd, 0) for pd in range(1, max_pd + 1)]
+        pd_vals = g.pd[1:]
         total_pooh = sum(pd_vals)
         avg_pooh = (total_pooh / max_pd) if max_pd > 0 else 0.0
 
-        g = agg.get(key, {"games": 0, "min": 0.0, "pts": 0, "reb": 0, "ast": 0, "stl": 0, "blk": 0, "to": 0})
-        games = g["games"] if g else 0
-
-        def per_game(n: float) -> float:
-            return (n / games) if games > 0 else 0.0
-
-        min_g = per_game(g["min"])
-        ppg   = per_game(g["pts"])
-        rpg   = per_game(g["reb"])
-        apg   = per_game(g["ast"])
-        bpg   = per_game(g["blk"])
-        spg   = per_game(g["stl"])
-        tpg   = per_game(g["to"])
+        if games > 0:
+            min_g, ppg, rpg, apg, bpg, spg, tpg = (
+                g.min / games, g.pts / games, g.reb / games, g.ast / games,
+                g.blk / games, g.stl / games, g.to / games,
+            )
+        else:
+            min_g = ppg = rpg = apg = bpg = spg = tpg = 0.0
 
         team_name = owner_by_player.get(key) or info.get("Team Name", "")
 
@@ -320,7 +384,7 @@ def main():
             "T/G": f"{tpg:.2f}",
         }
         for pd in range(1, max_pd + 1):
-            row[str(pd)] = str(pooh_by_player_pd.get(key, {}).get(pd, 0))
+            row[str(pd)] = str(pd_vals[pd - 1])
 
         rows_out.append(row)
 
@@ -1,6 +1,9 @@
 import os
 import html
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from openpyxl import load_workbook
 from openpyxl.styles.colors import Color
 
@@ -10,6 +13,31 @@ DOCS_DIR = os.path.join(REPO_ROOT, "docs")
 XLSX_PATH = os.path.join(DOCS_DIR, "Schedule 2026.xlsx")
 OUT_HTML = os.path.join(DOCS_DIR, "Schedule.html")
 
+# Key improvements:
+# - Explicit column widths for Date + PD so Date doesn't truncate.
+# - Schedule cells remain one-line (compact height) with ellipsis only if truly needed.
+# - Open Dates rendered as its own 2-column table (each row one line across).
+PAGE_STYLE = (
+    "<style>"
+    "html,body{margin:0;padding:0}"
+    "body{font-family:Calibri,Arial;background:#ffffff}"
+    ".wrap{max-width:99vw;margin:8px auto;border:3px solid #000;background:#FFFFCC;padding:8px;box-sizing:border-box}"
+    ".meta{font-size:10pt;margin:0 0 8px 0}"
+    ".schedule{border-collapse:collapse;width:100%;table-layout:fixed;background:#ffffff}"
+    ".schedule th,.schedule td{border:1px solid #000;padding:2px 4px;font-size:10pt;line-height:1.05;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}"
+    ".schedule th{background:#c0c0c0}"
+    ".titlecell{font-size:18pt;font-weight:700;text-align:center;background:#c0c0c0;padding:10px 6px}"
+    ".sectionTitle{margin-top:12px;font-weight:700}"
+    ".openDates{border-collapse:collapse;width:100%;background:#ffffff}"
+    ".openDates th,.openDates td{border:1px solid #000;padding:6px 8px;font-size:11pt;white-space:nowrap}"
+    ".openDates th{background:#c0c0c0;text-align:left}"
+    ".openDates td.date{width:110px;font-weight:700}"
+    "</style>"
+)
+
+# Same replacements as html.escape(s, quote=True), done in one str.translate pass.
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
 
 # ----------------------------
 # Theme color support helpers
@@ -23,12 +51,12 @@ def _rgb_to_hex(r: int, g: int, b: int):
 
 def _apply_tint_to_rgb(r: int, g: int, b: int, tint: float):
     tint = float(tint)
-    def adj(c):
-        if tint < 0:
-            return int(round(c * (1.0 + tint)))
-        else:
-            return int(round(c + (255 - c) * tint))
-    r2, g2, b2 = adj(r), adj(g), adj(b)
+    # Excel tint: negative darkens toward black, positive lightens toward white.
+    if tint < 0:
+        k = 1.0 + tint
+        r2, g2, b2 = round(r * k), round(g * k), round(b * k)
+    else:
+        r2, g2, b2 = round(r + (255 - r) * tint), round(g + (255 - g) * tint), round(b + (255 - b) * tint)
     return max(0, min(255, r2)), max(0, min(255, g2)), max(0, min(255, b2))
 
 def _get_theme_palette_hex(wb) -> list:
@@ -63,11 +91,15 @@ def _get_theme_palette_hex(wb) -> list:
     except Exception:
         return fallback
 
-def _css_color_from_openpyxl_color(c: Color, theme_palette_hex: list):
+def _css_color_from_openpyxl_color(c: Color, theme_palette_rgb: tuple):
     if c is None:
         return None
+    return _color_css(getattr(c, "rgb", None), getattr(c, "theme", None), getattr(c, "tint", None), theme_palette_rgb)
 
-    rgb = getattr(c, "rgb", None)
+@lru_cache(maxsize=256)
+def _color_css(rgb, theme_idx, tint, theme_palette_rgb: tuple):
+    # Keyed on the color's plain fields: a workbook only has a few distinct colors,
+    # so hex parsing and tint math run once per (rgb, theme, tint).
     if rgb:
         rgb = str(rgb).strip()
         if len(rgb) == 8:  # ARGB
@@ -76,16 +108,13 @@ def _css_color_from_openpyxl_color(c: Color, theme_palette_hex: list):
             return f"#{rgb.upper()}"
         return None
 
-    theme_idx = getattr(c, "theme", None)
     if theme_idx is not None:
         try:
             idx = int(theme_idx)
         except Exception:
             return None
-        if 0 <= idx < len(theme_palette_hex):
-            base_hex = theme_palette_hex[idx]
-            r, g, b = _hex_to_rgb(base_hex)
-            tint = getattr(c, "tint", None)
+        if 0 <= idx < len(theme_palette_rgb):
+            r, g, b = theme_palette_rgb[idx]
             if tint is not None:
                 r, g, b = _apply_tint_to_rgb(r, g, b, float(tint))
             return _rgb_to_hex(r, g, b)
@@ -96,7 +125,7 @@ def _css_color_from_openpyxl_color(c: Color, theme_palette_hex: list):
 # ----------------------------
 # Excel -> HTML styling
 # ----------------------------
-def _cell_style_to_css(cell, theme_palette_hex):
+def _cell_style_to_css(cell, theme_palette_rgb):
     styles = []
 
     fnt = cell.font
@@ -108,14 +137,14 @@ def _cell_style_to_css(cell, theme_palette_hex):
         if fnt.underline:
             styles.append("text-decoration:underline")
         if fnt.color is not None:
-            col = _css_color_from_openpyxl_color(fnt.color, theme_palette_hex)
+            col = _css_color_from_openpyxl_color(fnt.color, theme_palette_rgb)
             if col:
                 styles.append(f"color:{col}")
 
     fill = cell.fill
     if fill is not None and getattr(fill, "patternType", None) == "solid":
         fg = getattr(fill, "fgColor", None)
-        col = _css_color_from_openpyxl_color(fg, theme_palette_hex)
+        col = _css_color_from_openpyxl_color(fg, theme_palette_rgb)
         if col:
             styles.append(f"background:{col}")
 
@@ -129,30 +158,42 @@ def _cell_style_to_css(cell, theme_palette_hex):
     return ";".join(styles)
 
 def _escape_cell_value(v):
+    """Cell value as HTML text; blank cells become &nbsp; so borders still render."""
     if v is None:
-        return ""
-    return str(v)
-
-def _row_is_blank(ws, r, max_col):
-    for c in range(1, max_col + 1):
-        v = ws.cell(row=r, column=c).value
-        if v is not None and str(v).strip() != "":
-            return False
-    return True
+        return "&nbsp;"
+    t = type(v)
+    if t is int or t is float:
+        return str(v)  # digits only, nothing to escape
+    s = str(v)
+    if not s.strip():
+        return "&nbsp;"
+    return s.translate(HTML_ESCAPE_TABLE)
+
+def _is_merge_covered(row_entry, c):
+    """
+    row_entry = (starts, spans) for one row, where spans are the merged ranges crossing
+    that row sorted by first column, as (min_col, max_col, first_covered_col).
+    True when column c is hidden under a merge (i.e. inside one but not its top-left cell).
+    """
+    starts, spans = row_entry
+    i = bisect_right(starts, c) - 1
+    if i < 0:
+        return False
+    _, hi, first = spans[i]
+    return first <= c <= hi
 
 
 # ----------------------------
 # Notes parsing: detect "Open Dates" block
 # ----------------------------
-def _find_open_dates_row(ws, start_row, end_row, max_col):
-    for r in range(start_row, end_row + 1):
-        for c in range(1, max_col + 1):
-            v = ws.cell(row=r, column=c).value
+def _find_open_dates_row(values, start_row, end_row):
+    for r, row in enumerate(values[start_row - 1:end_row], start=start_row):
+        for c, v in enumerate(row, start=1):
             if v is not None and str(v).strip().lower() == "open dates":
                 return r, c
     return None, None
 
-def _read_open_dates_block(ws, title_row, title_col, max_row):
+def _read_open_dates_block(values, title_row, title_col, max_row):
     """
     Expected layout (like your screenshot):
       Row title_row has "Open Dates" in col A (or some col)
@@ -162,11 +203,10 @@ def _read_open_dates_block(ws, title_row, title_col, max_row):
     We'll read until we hit an entirely blank row OR a row where both A and B are blank.
     """
     out = []
-    r = title_row + 1
     last_date = ""
-    while r <= max_row:
-        a = ws.cell(row=r, column=title_col).value
-        b = ws.cell(row=r, column=title_col + 1).value
+    for row in values[title_row:max_row]:
+        a = row[title_col - 1]
+        b = row[title_col] if title_col < len(row) else None
 
         a_s = (str(a).strip() if a is not None else "")
         b_s = (str(b).strip() if b is not None else "")
@@ -182,7 +222,6 @@ def _read_open_dates_block(ws, title_row, title_col, max_row):
         b_one_line = " ".join(b_s.replace("\n", " ").split())
 
         out.append((last_date, b_one_line))
-        r += 1
 
     return out
 
@@ -191,40 +230,48 @@ def main():
     if not os.path.isfile(XLSX_PATH):
         raise SystemExit(f"ERROR: Missing file: {XLSX_PATH}")
 
+    # One normal load: values, styles and merged ranges all come from it.
     wb = load_workbook(XLSX_PATH, data_only=True)
     ws = wb.active
-    theme_palette_hex = _get_theme_palette_hex(wb)
+    # Parse the 12 theme colors to RGB once; a tuple of tuples is hashable for _color_css.
+    theme_palette_rgb = tuple(_hex_to_rgb(h) for h in _get_theme_palette_hex(wb))
 
     max_row = ws.max_row or 1
     max_col = ws.max_column or 1
 
+    cells = [list(row) for row in ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col)]
+    values = [[cell.value for cell in row] for row in cells]
+    merged_ranges = ws.merged_cells.ranges
+
     # Find blank row separating schedule from notes area
-    split_row = None
-    for r in range(1, max_row + 1):
-        if _row_is_blank(ws, r, max_col):
-            split_row = r
-            break
+    split_row = next(
+        (r for r, row in enumerate(values, start=1)
+         if not any(v is not None and str(v).strip() for v in row)),
+        None,
+    )
 
     schedule_end = (split_row - 1) if split_row else max_row
     notes_start = (split_row + 1) if split_row else None
 
-    # merged-cell maps for schedule
+    # merged-cell maps for schedule: spans by top-left cell + per-row column intervals
     merged_top_left = {}
-    merged_covered = set()
-    for m in ws.merged_cells.ranges:
+    row_spans = defaultdict(list)
+    for m in merged_ranges:
         rs = m.max_row - m.min_row + 1
         cs = m.max_col - m.min_col + 1
         merged_top_left[(m.min_row, m.min_col)] = (rs, cs)
         for rr in range(m.min_row, m.max_row + 1):
-            for cc in range(m.min_col, m.max_col + 1):
-                if (rr, cc) != (m.min_row, m.min_col):
-                    merged_covered.add((rr, cc))
+            first = m.min_col + 1 if rr == m.min_row else m.min_col
+            row_spans[rr].append((m.min_col, m.max_col, first))
+    row_merges = {}
+    for rr, spans in row_spans.items():
+        spans.sort()
+        row_merges[rr] = ([lo for lo, _, _ in spans], spans)
 
     # If row 1 has only one non-empty cell and it's not merged, force it to span full width.
     def row1_title_colspan_override():
         nonempty = []
-        for c in range(1, max_col + 1):
-            v = ws.cell(row=1, column=c).value
+        for c, v in enumerate(values[0], start=1):
             if v is not None and str(v).strip() != "":
                 nonempty.append(c)
         if len(nonempty) == 1:
@@ -240,103 +287,104 @@ def main():
     # Parse Open Dates block (in notes area)
     open_dates = []
     if notes_start and notes_start <= max_row:
-        od_row, od_col = _find_open_dates_row(ws, notes_start, max_row, max_col)
+        od_row, od_col = _find_open_dates_row(values, notes_start, max_row)
         if od_row is not None:
-            open_dates = _read_open_dates_block(ws, od_row, od_col, max_row)
-
-    with open(OUT_HTML, "w", encoding="utf-8") as f:
-        f.write("<!doctype html><html><head><meta charset='utf-8'>")
-        f.write("<title>Schedule</title>")
-
-        # Key improvements:
-        # - Explicit column widths for Date + PD so Date doesn't truncate.
-        # - Schedule cells remain one-line (compact height) with ellipsis only if truly needed.
-        # - Open Dates rendered as its own 2-column table (each row one line across).
-        f.write(
-            "<style>"
-            "html,body{margin:0;padding:0}"
-            "body{font-family:Calibri,Arial;background:#ffffff}"
-            ".wrap{max-width:99vw;margin:8px auto;border:3px solid #000;background:#FFFFCC;padding:8px;box-sizing:border-box}"
-            ".meta{font-size:10pt;margin:0 0 8px 0}"
-            ".schedule{border-collapse:collapse;width:100%;table-layout:fixed;background:#ffffff}"
-            ".schedule th,.schedule td{border:1px solid #000;padding:2px 4px;font-size:10pt;line-height:1.05;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}"
-            ".schedule th{background:#c0c0c0}"
-            ".titlecell{font-size:18pt;font-weight:700;text-align:center;background:#c0c0c0;padding:10px 6px}"
-            ".sectionTitle{margin-top:12px;font-weight:700}"
-            ".openDates{border-collapse:collapse;width:100%;background:#ffffff}"
-            ".openDates th,.openDates td{border:1px solid #000;padding:6px 8px;font-size:11pt;white-space:nowrap}"
-            ".openDates th{background:#c0c0c0;text-align:left}"
-            ".openDates td.date{width:110px;font-weight:700}"
-            "</style>"
-        )
-
-        f.write("</head><body><div class='wrap'>")
-        f.write(f"<div class='meta'><b>Last updated:</b> {html.escape(updated)}</div>")
-
-        # -------- Schedule table --------
-        f.write("<table class='schedule'>")
-
-        # Column widths: Date wider, PD thinner, rest share remaining width.
-        f.write("<colgroup>")
-        f.write("<col style='width:140px'>")  # Date
-        f.write("<col style='width:42px'>")   # PD
-        for _ in range(3, max_col + 1):
-            f.write("<col>")
-        f.write("</colgroup>")
-
-        for r in range(1, schedule_end + 1):
-            f.write("<tr>")
-            for c in range(1, max_col + 1):
-                if (r, c) in merged_covered:
-                    continue
-
-                cell = ws.cell(row=r, column=c)
-                tag = "th" if r <= 2 else "td"
-                attrs = []
-                css = _cell_style_to_css(cell, theme_palette_hex)
-
-                # Title row: force colspan across all columns
-                if r == 1 and title_col is not None and c == title_col:
-                    val = html.escape(_escape_cell_value(cell.value))
-                    f.write(f"<td class='titlecell' colspan='{max_col}'>{val}</td>")
-                    break
+            open_dates = _read_open_dates_block(values, od_row, od_col, max_row)
+
+    parts = []
+    append = parts.append
+    append(
+        f"<!doctype html><html><head><meta charset='utf-8'><title>Schedule</title>{PAGE_STYLE}</head>"
+        f"<body><div class='wrap'><div class='meta'><b>Last updated:</b> {html.escape(updated)}</div>"
+    )
+
+    # -------- Schedule table --------
+    append("<table class='schedule'>")
+
+    # Column widths: Date wider, PD thinner, rest share remaining width.
+    append("<colgroup>")
+    append("<col style='width:140px'>")  # Date
+    append("<col style='width:42px'>")   # PD
+    for _ in range(3, max_col + 1):
+        append("<col>")
+    append("</colgroup>")
+
+    # Cells share a handful of workbook styles; convert each cell.style_id to CSS once.
+    style_cache = {}
+    # Merge spans and styles repeat too, so the whole opening tag is cached per
+    # (tag, span, cell.style_id).
+    open_tag_cache = {}
+
+    # Local names for the per-cell loop.
+    cell_style_to_css = _cell_style_to_css
+    is_merge_covered = _is_merge_covered
+    escape_cell_value = _escape_cell_value
+    style_get = style_cache.get
+    open_tag_get = open_tag_cache.get
+    span_get = merged_top_left.get
+
+    for r, row_cells in enumerate(cells[:schedule_end], start=1):
+        append("<tr>")
+        tag = "th" if r <= 2 else "td"
+        close_tag = f"</{tag}>"
+        merges = row_merges.get(r)  # None for rows no merge crosses (the common case)
+        for c, cell in enumerate(row_cells, start=1):
+            if merges is not None and is_merge_covered(merges, c):
+                continue
 
+            # Title row: force colspan across all columns
+            if r == 1 and title_col is not None and c == title_col:
+                val = escape_cell_value(cell.value)
+                append(f"<td class='titlecell' colspan='{max_col}'>{val}</td>")
+                break
+
+            style_id = cell.style_id  # public, unlike the cell's _style internals
+            span = span_get((r, c))
+            key = (tag, span, style_id)
+            open_tag = open_tag_get(key)
+            if open_tag is None:
+                attrs = []
                 # Real merges
-                if (r, c) in merged_top_left:
-                    rs, cs = merged_top_left[(r, c)]
+                if span is not None:
+                    rs, cs = span
                     if rs > 1:
                         attrs.append(f"rowspan='{rs}'")
                     if cs > 1:
                         attrs.append(f"colspan='{cs}'")
 
+                css = style_get(style_id)
+                if css is None:
+                    css = style_cache[style_id] = cell_style_to_css(cell, theme_palette_rgb)
                 if css:
                     attrs.append(f"style='{css}'")
 
-                val = html.escape(_escape_cell_value(cell.value))
-                if val.strip() == "":
-                    val = "&nbsp;"
-                f.write(f"<{tag} {' '.join(attrs)}>{val}</{tag}>")
+                open_tag = open_tag_cache[key] = f"<{tag} {' '.join(attrs)}>"
+
+            append(open_tag + escape_cell_value(cell.value) + close_tag)
+
+        append("</tr>")
 
-            f.write("</tr>")
+    append("</table>")
 
-        f.write("</table>")
+    # -------- Open Dates block (2 columns, each row one line across) --------
+    if open_dates:
+        append("<div class='sectionTitle'>Open Dates</div>")
+        append("<table class='openDates'>")
+        append("<tr><th style='width:110px'>Date</th><th>Teams</th></tr>")
+        for d, teams in open_dates:
+            d_html = d.translate(HTML_ESCAPE_TABLE) if d else "&nbsp;"
+            t_html = teams.translate(HTML_ESCAPE_TABLE) if teams else "&nbsp;"
+            append(f"<tr><td class='date'>{d_html}</td><td>{t_html}</td></tr>")
+        append("</table>")
 
-        # -------- Open Dates block (2 columns, each row one line across) --------
-        if open_dates:
-            f.write("<div class='sectionTitle'>Open Dates</div>")
-            f.write("<table class='openDates'>")
-            f.write("<tr><th style='width:110px'>Date</th><th>Teams</th></tr>")
-            for d, teams in open_dates:
-                d_html = html.escape(d) if d else "&nbsp;"
-                t_html = html.escape(teams) if teams else "&nbsp;"
-                f.write(f"<tr><td class='date'>{d_html}</td><td>{t_html}</td></tr>")
-            f.write("</table>")
+    append("<div style='margin-top:10px;font-size:10pt;'>")
+    append(f"<a href='{html.escape(os.path.basename(XLSX_PATH))}'>Download the Excel version</a>")
+    append("</div>")
 
-        f.write("<div style='margin-top:10px;font-size:10pt;'>")
-        f.write(f"<a href='{html.escape(os.path.basename(XLSX_PATH))}'>Download the Excel version</a>")
-        f.write("</div>")
+    append("</div></body></html>")
 
-        f.write("</div></body></html>")
+    with open(OUT_HTML, "wb") as f:
+        f.write("".join(parts).encode("utf-8"))
 
     print(f"Wrote: {OUT_HTML}")
 
@@ -1,26 +1,36 @@
 import os
 import re
 import sys
-from collections import defaultdict
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from lxml import html as lxml_html
 
 DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "docs")
 
+_RE_CAP_PD = re.compile(r"PD(\d+)")
+_PD_FILE_PREFIX = "Final_Owners_PD"
+_PD_FILE_SUFFIX = ".html"
+
+_TD_NUM = "<td class='num'>"
+_TD_NUM_SEP = "</td>" + _TD_NUM
+
 
 def parse_cap_pd(argv) -> int | None:
     # optional: PD7
     if len(argv) < 2:
         return None
     s = argv[1].strip().upper()
-    m = re.fullmatch(r"PD(\d+)", s)
+    m = _RE_CAP_PD.fullmatch(s)
     if not m:
         raise SystemExit("Usage: python app/build_summary_to_date.py [PD7]")
     return int(m.group(1))
 
 
 def pd_num_from_filename(fn: str) -> int | None:
-    m = re.search(r"Final_Owners_PD(\d+)\.html$", fn)
-    return int(m.group(1)) if m else None
+    # Final_Owners_PD<n>.html -> n, without going through the regex engine per directory entry
+    if not (fn.startswith(_PD_FILE_PREFIX) and fn.endswith(_PD_FILE_SUFFIX)):
+        return None
+    mid = fn[len(_PD_FILE_PREFIX):-len(_PD_FILE_SUFFIX)]
+    return int(mid) if mid.isdecimal() else None
 
 
 def read_owner_totals_from_final_owners_html(path: str) -> dict[str, int]:
@@ -29,22 +39,20 @@ def read_owner_totals_from_final_owners_html(path: str) -> dict[str, int]:
       Owner | Starter Pooh Total | Starters Count So Far
     Returns {owner: starter_pooh_total}.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
-
-    table = soup.find("table")
-    if not table:
+    doc = lxml_html.parse(path, lxml_html.HTMLParser(encoding="utf-8")).getroot()
+    table = doc.find(".//table") if doc is not None else None
+    if table is None:
         return {}
 
-    rows = table.find_all("tr")
+    rows = list(table.iter("tr"))
     out: dict[str, int] = {}
 
     for tr in rows[1:]:
-        tds = tr.find_all("td")
+        tds = tr.findall("td")
         if len(tds) < 2:
             continue
-        owner = tds[0].get_text(strip=True)
-        total_txt = tds[1].get_text(strip=True)
+        owner = tds[0].text_content().strip()
+        total_txt = tds[1].text_content().strip()
         try:
             out[owner] = int(total_txt)
         except:
@@ -58,13 +66,14 @@ def main():
 
     # Find Final_Owners_PD*.html
     pd_files: list[tuple[int, str]] = []
-    for fn in os.listdir(DOCS_DIR):
-        n = pd_num_from_filename(fn)
-        if n is None:
-            continue
-        if cap_pd is not None and n > cap_pd:
-            continue
-        pd_files.append((n, fn))
+    with os.scandir(DOCS_DIR) as it:
+        for entry in it:
+            n = pd_num_from_filename(entry.name)
+            if n is None or not entry.is_file():
+                continue
+            if cap_pd is not None and n > cap_pd:
+                continue
+            pd_files.append((n, entry.name))
 
     pd_files.sort(key=lambda x: x[0])  # PD1..PDN
 
@@ -73,102 +82,105 @@ def main():
 
     max_pd = pd_files[-1][0]
 
-    # per_owner_per_pd[owner][pd] = points for that PD
-    per_owner_per_pd: dict[str, dict[int, int]] = defaultdict(dict)
-    owners_set = set()
+    # lxml releases the GIL while reading/parsing, so the files parse concurrently;
+    # results come back in PD order and are folded in here.
+    paths = [os.path.join(DOCS_DIR, fn) for _, fn in pd_files]
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        parsed = list(ex.map(read_owner_totals_from_final_owners_html, paths))
 
-    for pd, fn in pd_files:
-        path = os.path.join(DOCS_DIR, fn)
-        totals = read_owner_totals_from_final_owners_html(path)
-        for owner, v in totals.items():
-            owners_set.add(owner)
-            per_owner_per_pd[owner][pd] = int(v)
+    # Dense owner x PD grid: scores[i][pd - 1] = points for owners[i] in that PD (0 if absent)
+    owners: list[str] = []
+    owner_idx: dict[str, int] = {}
+    scores: list[list[int]] = []
 
-    owners = sorted(list(owners_set))
+    for (pd, _), totals in zip(pd_files, parsed):
+        for owner, v in totals.items():
+            i = owner_idx.get(owner)
+            if i is None:
+                i = owner_idx[owner] = len(owners)
+                owners.append(owner)
+                scores.append([0] * max_pd)
+            scores[i][pd - 1] = int(v)
 
     # Totals + avg
-    pd_list = [pd for pd, _ in pd_files]
-    completed_pd_count = len(pd_list)
-
-    owner_total: dict[str, int] = {}
-    owner_avg: dict[str, float] = {}
+    completed_pd_count = len(pd_files)
 
-    for owner in owners:
-        pd_scores = [per_owner_per_pd[owner].get(pd, 0) for pd in pd_list]
-        total = sum(pd_scores)
-        owner_total[owner] = total
-        owner_avg[owner] = (total / completed_pd_count) if completed_pd_count > 0 else 0.0
+    totals = [sum(row) for row in scores]
+    avgs = [(t / completed_pd_count) if completed_pd_count > 0 else 0.0 for t in totals]
 
     # Sort by Total Pooh descending
-    owners_sorted = sorted(owners, key=lambda o: (-owner_total.get(o, 0), o))
+    order = sorted(range(len(owners)), key=lambda i: (-totals[i], owners[i]))
 
     # Reference totals for Out Of 1st/2nd/3rd
-    top1 = owner_total.get(owners_sorted[0], 0) if len(owners_sorted) >= 1 else 0
-    top2 = owner_total.get(owners_sorted[1], top1) if len(owners_sorted) >= 2 else top1
-    top3 = owner_total.get(owners_sorted[2], top2) if len(owners_sorted) >= 3 else top2
+    top1 = totals[order[0]] if len(order) >= 1 else 0
+    top2 = totals[order[1]] if len(order) >= 2 else top1
+    top3 = totals[order[2]] if len(order) >= 3 else top2
 
     # Write SummaryToDate.html with your headers
     out_path = os.path.join(DOCS_DIR, "SummaryToDate.html")
 
-    with open(out_path, "w", encoding="utf-8") as out:
-        out.write("<!doctype html><html><head><meta charset='utf-8'>")
-        out.write("<title>Sorted League Results</title>")
-        out.write(
-            "<style>"
-            "body{font-family:Arial}"
-            "table{border-collapse:collapse;font-size:14px}"
-            "th,td{border:1px solid #ccc;padding:4px 6px}"
-            "th{background:#eee}"
-            "td.num{text-align:right}"
-            "</style>"
-        )
-        out.write("</head><body>")
-        out.write("<h2 style='text-align:center'>Sorted League Results</h2>")
-
-        out.write("<table><thead><tr>")
-        out.write("<th>Team Name</th>")
-        out.write("<th>Total Pooh</th>")
-        out.write("<th>Out Of 1st</th>")
-        out.write("<th>Out Of 2nd</th>")
-        out.write("<th>Out Of 3rd</th>")
-
-        # PD columns: 1..max_pd (not hardcoded 19)
-        for pd in range(1, max_pd + 1):
-            out.write(f"<th>{pd}</th>")
-
-        out.write("<th>Avg Pooh Per Completed PD</th>")
-
-        # Keep this column but leave it blank for every row (per your instruction)
-        out.write("<th>Sum of Avgs, Top 5 Eligible</th>")
-
-        # DO NOT include "Remaining Current PD"
-        out.write("</tr></thead><tbody>")
-
-        for owner in owners_sorted:
-            total = owner_total.get(owner, 0)
-
-            out1 = max(0, top1 - total)
-            out2 = max(0, top2 - total)
-            out3 = max(0, top3 - total)
-
-            out.write("<tr>")
-            out.write(f"<td>{owner}</td>")
-            out.write(f"<td class='num'>{total}</td>")
-            out.write(f"<td class='num'>{out1}</td>")
-            out.write(f"<td class='num'>{out2}</td>")
-            out.write(f"<td class='num'>{out3}</td>")
-
-            for pd in range(1, max_pd + 1):
-                out.write(f"<td class='num'>{per_owner_per_pd[owner].get(pd, 0)}</td>")
-
-            out.write(f"<td class='num'>{owner_avg.get(owner, 0.0):.2f}</td>")
-
-            # Blank column on purpose
-            out.write("<td class='num'></td>")
-
-            out.write("</tr>")
-
-        out.write("</tbody></table></body></html>")
+    parts: list[str] = []
+    append = parts.append
+    append("<!doctype html><html><head><meta charset='utf-8'>")
+    append("<title>Sorted League Results</title>")
+    append(
+        "<style>"
+        "body{font-family:Arial}"
+        "table{border-collapse:collapse;font-size:14px}"
+        "th,td{border:1px solid #ccc;padding:4px 6px}"
+        "th{background:#eee}"
+        "td.num{text-align:right}"
+        "</style>"
+    )
+    append("</head><body>")
+    append("<h2 style='text-align:center'>Sorted League Results</h2>")
+
+    append("<table><thead><tr>")
+    append("<th>Team Name</th>")
+    append("<th>Total Pooh</th>")
+    append("<th>Out Of 1st</th>")
+    append("<th>Out Of 2nd</th>")
+    append("<th>Out Of 3rd</th>")
+
+    # PD columns: 1..max_pd (not hardcoded 19)
+    append("".join(f"<th>{pd}</th>" for pd in range(1, max_pd + 1)))
+
+    append("<th>Avg Pooh Per Completed PD</th>")
+
+    # Keep this column but leave it blank for every row (per your instruction)
+    append("<th>Sum of Avgs, Top 5 Eligible</th>")
+
+    # DO NOT include "Remaining Current PD"
+    append("</tr></thead><tbody>")
+
+    for i in order:
+        owner = owners[i]
+        total = totals[i]
+
+        out1 = max(0, top1 - total)
+        out2 = max(0, top2 - total)
+        out3 = max(0, top3 - total)
+
+        append("<tr>")
+        append(f"<td>{owner}</td>")
+
+        # Total, Out Of 1st/2nd/3rd, then one cell per PD: a single join per
+        # row instead of an f-string per cell
+        nums = [total, out1, out2, out3]
+        nums.extend(scores[i])
+        append(_TD_NUM + _TD_NUM_SEP.join(map(str, nums)) + "</td>")
+
+        append(f"<td class='num'>{avgs[i]:.2f}</td>")
+
+        # Blank column on purpose
+        append("<td class='num'></td>")
+
+        append("</tr>")
+
+    append("</tbody></table></body></html>")
+
+    with open(out_path, "wb") as out:
+        out.write("".join(parts).encode("utf-8"))
 
     print(f"Wrote: {out_path}")
 
@@ -1,15 +1,21 @@
 import sys
+import json
 import time
 import random
 import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import os
-import html
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Tuple, Optional
 
-from bs4 import BeautifulSoup  # safe to keep (used elsewhere in your project)
 from openpyxl import load_workbook, Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, Alignment
 
@@ -24,55 +30,118 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0 Safari/537.36",
     "Accept": "application/json,text/plain,*/*",
     "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
     "Referer": "https://www.espn.com/",
     "Connection": "keep-alive",
 }
 
-SESSION = requests.Session()
-SESSION.headers.update(HEADERS)
-
-BASE_DELAY = 0.25
-JITTER = 0.25
+MAX_REQUESTS_PER_SEC = 4  # shared by all fetch threads
+RETRY_AFTER_CAP = 60      # seconds; upper bound on a server-requested 429 wait
 MAX_RETRIES = 6
 TIMEOUT = 30
+BOXSCORE_WORKERS = 8  # concurrent summary requests per day
+
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+# Keep-alive pool big enough for the concurrent boxscore fetches; retries stay in get_json.
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=BOXSCORE_WORKERS, max_retries=0)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
 
 LOCAL_TZ = ZoneInfo("America/Chicago")
 UTC_TZ = ZoneInfo("UTC")
 
+_RE_PUNCT = re.compile(r"[^\w\s]")
+_NAME_SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv"))
+
+
+class _PunctTable(dict):
+    # str.translate table sending every [^\w\s] char to a space; filled per code point on first use
+    def __missing__(self, cp):
+        v = self[cp] = 0x20 if _RE_PUNCT.match(chr(cp)) else cp
+        return v
+
+
+_PUNCT_TABLE = _PunctTable()
+_RE_YYYYMMDD = re.compile(r"\d{8}")
+
+# Boxscore columns compute_pooh reads, in argument order; stat groups missing any are skipped.
+POOH_COLUMNS = ("MIN", "FG", "FT", "REB", "AST", "STL", "BLK", "TO", "PTS")
+POOH_LABELS = frozenset(POOH_COLUMNS)
+# Raw stat values ESPN uses for "did not play"; each parses to 0.
+DNP_MARKS = (None, "", "--")
+
+# Same replacements as html.escape(s, quote=True), done in one str.translate pass.
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
 
 # ----------------------------
 # UTIL
 # ----------------------------
+_request_times = deque()  # start times of requests in the last second
+_request_lock = threading.Lock()
+
 def polite_sleep():
-    time.sleep(BASE_DELAY + random.random() * JITTER)
+    # Block only when another request would exceed MAX_REQUESTS_PER_SEC,
+    # instead of sleeping after every response.
+    with _request_lock:
+        now = time.monotonic()
+        while _request_times and now - _request_times[0] >= 1.0:
+            _request_times.popleft()
+        if len(_request_times) >= MAX_REQUESTS_PER_SEC:
+            time.sleep(1.0 - (now - _request_times.popleft()))
+            now = time.monotonic()
+        _request_times.append(now)
 
 def get_json(url: str) -> dict:
     last_err = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
+            polite_sleep()
             r = SESSION.get(url, timeout=TIMEOUT)
             r.raise_for_status()
-            polite_sleep()
-            return r.json()
+            # Parse the raw body: skips Response.text's charset sniffing and the str copy.
+            return json.loads(r.content)
         except Exception as e:
             last_err = e
-            time.sleep((0.7 ** attempt) + random.random() * 0.7)
+            delay = (0.7 ** attempt) + random.random() * 0.7
+            resp = getattr(e, "response", None)
+            if resp is not None and resp.status_code == 429:
+                # Rate limited: wait as long as the server asks (Retry-After in seconds)
+                retry_after = (resp.headers.get("Retry-After") or "").strip()
+                if retry_after.isdigit():
+                    delay = max(delay, min(int(retry_after), RETRY_AFTER_CAP))
+            time.sleep(delay)
     raise RuntimeError(f"Failed after retries: {url}\nLast error: {last_err}")
 
 def safe_int(v) -> int:
+    t = type(v)
+    if t is int:
+        return v
     try:
-        return int(str(v).strip())
+        if t is float:
+            return int(v)
+        return int((v if t is str else str(v)).strip())
     except:
         return 0
 
 def parse_made_attempt(s: str) -> Tuple[int, int]:
+    s = s if type(s) is str else str(s)
+    # Fast path for the usual "3-7": no list from split(), no exception machinery.
+    a, _, b = s.partition("-")
+    if a.isdecimal() and b.isdecimal():
+        return int(a), int(b)
+    # Anything else (padding, signs, "--", extra dashes) keeps the original rules.
     try:
-        a, b = str(s).split("-")
+        a, b = s.split("-")
         return int(a), int(b)
     except:
         return 0, 0
 
 def to_minutes(v) -> float:
+    # ESPN minutes are almost always a bare integer string ("23"): no strip/sentinel/try needed.
+    if type(v) is str and v.isdecimal():
+        return float(v)
     if v is None:
         return 0.0
     s = str(v).strip()
@@ -89,55 +158,36 @@ def to_minutes(v) -> float:
     except:
         return 0.0
 
+@lru_cache(maxsize=4096)
 def norm_name(name: str) -> str:
-    s = (name or "").lower()
-    s = re.sub(r"[^\w\s]", " ", s)
-    s = re.sub(r"\b(jr|sr|ii|iii|iv)\b", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    # After punctuation -> space the string is only word runs and whitespace,
+    # so \b-delimited suffixes are exactly whole tokens.
+    s = (name or "").lower().translate(_PUNCT_TABLE)
+    return " ".join(t for t in s.split() if t not in _NAME_SUFFIXES)
 
-def compute_pooh(values: List[str], labels: List[str]) -> Optional[dict]:
+def compute_pooh(fields: Tuple) -> Optional[dict]:
     # Pooh = PTS + REB + AST + STL + BLK - missedFG - missedFT - TO
-    if not labels or not values:
-        return None
+    # fields: one athlete's raw stats picked out in POOH_COLUMNS order
+    v_min, v_fg, v_ft, v_reb, v_ast, v_stl, v_blk, v_to, v_pts = fields
 
-    def idx(name: str) -> Optional[int]:
-        try:
-            return labels.index(name)
-        except ValueError:
-            return None
-
-    i_min = idx("MIN")
-    i_fg  = idx("FG")
-    i_ft  = idx("FT")
-    i_reb = idx("REB")
-    i_ast = idx("AST")
-    i_stl = idx("STL")
-    i_blk = idx("BLK")
-    i_to  = idx("TO")
-    i_pts = idx("PTS")
-
-    required = [i_min, i_fg, i_ft, i_reb, i_ast, i_stl, i_blk, i_to, i_pts]
-    if any(x is None for x in required):
+    # DNP rows are all "--"/blank and would parse to all zeros, so skip them up front.
+    # (MIN alone is not enough: a "0"-minute row with a stat still scores.)
+    if all(v in DNP_MARKS for v in fields):
         return None
 
-    max_i = max(required)
-    if len(values) <= max_i:
-        return None
-
-    mins = to_minutes(values[i_min])
-    fgm, fga = parse_made_attempt(values[i_fg])
-    ftm, fta = parse_made_attempt(values[i_ft])
+    mins = to_minutes(v_min)
+    fgm, fga = parse_made_attempt(v_fg)
+    ftm, fta = parse_made_attempt(v_ft)
 
     missed_fg = max(0, fga - fgm)
     missed_ft = max(0, fta - ftm)
 
-    pts = safe_int(values[i_pts])
-    reb = safe_int(values[i_reb])
-    ast = safe_int(values[i_ast])
-    stl = safe_int(values[i_stl])
-    blk = safe_int(values[i_blk])
-    tov = safe_int(values[i_to])
+    pts = safe_int(v_pts)
+    reb = safe_int(v_reb)
+    ast = safe_int(v_ast)
+    stl = safe_int(v_stl)
+    blk = safe_int(v_blk)
+    tov = safe_int(v_to)
 
     # Skip truly blank/DNP rows
     if mins == 0 and pts == 0 and reb == 0 and ast == 0 and stl == 0 and blk == 0 and tov == 0 and fga == 0 and fta == 0:
@@ -153,7 +203,7 @@ def compute_pooh(values: List[str], labels: List[str]) -> Optional[dict]:
 
 def parse_yyyymmdd(s: str) -> datetime:
     s = (s or "").strip()
-    if not re.fullmatch(r"\d{8}", s):
+    if not _RE_YYYYMMDD.fullmatch(s):
         raise ValueError("Date must be YYYYMMDD (8 digits).")
     dt = datetime.strptime(s, "%Y%m%d")
     # Interpret as local date at midnight in America/Chicago
@@ -190,13 +240,14 @@ def event_local_yyyymmdd(e: dict) -> str:
 # DRAFT BOARD
 # ----------------------------
 def load_draft_board(xlsx_path: str) -> Tuple[Dict[str, dict], List[str]]:
-    wb = load_workbook(xlsx_path)
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
     ws = wb.active
 
+    header_row = next(ws.iter_rows(max_row=1, values_only=True), ())
     headers = {}
-    for cell in ws[1]:
-        h = str(cell.value).strip() if cell.value is not None else ""
-        headers[h.lower()] = cell.column
+    for i, v in enumerate(header_row):
+        h = str(v).strip() if v is not None else ""
+        headers[h.lower()] = i  # zero-based index into each row tuple
 
     if "name" not in headers or "owner" not in headers:
         raise RuntimeError("ByCoach.xlsx must have columns: Name, Owner (and optional Started).")
@@ -208,10 +259,11 @@ def load_draft_board(xlsx_path: str) -> Tuple[Dict[str, dict], List[str]]:
     draft_map: Dict[str, dict] = {}
     owner_order: List[str] = []
 
-    for r in range(2, ws.max_row + 1):
-        nm = ws.cell(row=r, column=col_name).value
-        ow = ws.cell(row=r, column=col_owner).value
-        st = ws.cell(row=r, column=col_started).value if col_started else None
+    # Value tuples padded/cut to the header width, so every index above is valid.
+    for row in ws.iter_rows(min_row=2, max_col=len(header_row), values_only=True):
+        nm = row[col_name]
+        ow = row[col_owner]
+        st = row[col_started] if col_started is not None else None
 
         name = str(nm).strip() if nm else ""
         owner = str(ow).strip() if ow else ""
@@ -230,6 +282,7 @@ def load_draft_board(xlsx_path: str) -> Tuple[Dict[str, dict], List[str]]:
         if owner and owner != "Undrafted" and owner not in owner_order:
             owner_order.append(owner)
 
+    wb.close()
     return draft_map, owner_order
 
 
@@ -243,13 +296,20 @@ def get_sec_events(date_yyyymmdd: str) -> List[dict]:
     events = data.get("events", []) or []
 
     # STRICT FILTER: only keep events whose actual local date matches the requested date.
-    filtered = [e for e in events if event_local_yyyymmdd(e) == date_yyyymmdd]
-
-    if len(filtered) != len(events):
+    # Each event's local date is computed once and reused for the dropped-event report.
+    filtered = []
+    offenders = []
+    for e in events:
+        local_date = event_local_yyyymmdd(e)
+        if local_date == date_yyyymmdd:
+            filtered.append(e)
+        else:
+            offenders.append((e, local_date))
+
+    if offenders:
         print(f"NOTE: Filtered scoreboard events for {date_yyyymmdd}: kept {len(filtered)} of {len(events)}")
-        offenders = [e for e in events if event_local_yyyymmdd(e) != date_yyyymmdd]
-        for e in offenders[:5]:
-            print(f"  Dropped event {e.get('id')} local_date={event_local_yyyymmdd(e)} raw={e.get('date')}")
+        for e, local_date in offenders[:5]:
+            print(f"  Dropped event {e.get('id')} local_date={local_date} raw={e.get('date')}")
 
     return filtered
 
@@ -280,14 +340,14 @@ def extract_event_header(e: dict) -> dict:
 # BOXSCORE PARSE
 # ----------------------------
 def iter_athlete_rows(stat_group: dict) -> List[dict]:
-    rows = []
+    # ESPN normally fills just one of these keys; return that list as-is and only
+    # concatenate when several are present (the caller's `seen` set drops repeats).
+    rows = None
     for key in ("athletes", "bench", "reserves"):
         v = stat_group.get(key)
-        if isinstance(v, list):
-            rows.extend(v)
-    if not rows and isinstance(stat_group.get("athletes"), list):
-        rows = stat_group["athletes"]
-    return rows
+        if isinstance(v, list) and v:
+            rows = v if rows is None else rows + v
+    return rows if rows is not None else []
 
 def get_boxscore_players(event_id: str) -> List[dict]:
     url = f"{BASE}/summary?event={event_id}"
@@ -309,6 +369,18 @@ def get_boxscore_players(event_id: str) -> List[dict]:
             if not labels:
                 continue
 
+            # First occurrence wins, as with labels.index()
+            label_index = {}
+            for i, label in enumerate(labels):
+                label_index.setdefault(label, i)
+            if not POOH_LABELS.issubset(label_index):
+                continue
+
+            # Resolve the Pooh columns once per group; each athlete is then a single C-level gather.
+            cols = [label_index[label] for label in POOH_COLUMNS]
+            pick = itemgetter(*cols)
+            width = max(cols) + 1
+
             for ath in iter_athlete_rows(stat_group):
                 athlete = ath.get("athlete", {}) or {}
                 aid = str(athlete.get("id") or "")
@@ -318,7 +390,10 @@ def get_boxscore_players(event_id: str) -> List[dict]:
                 if aid and aid in seen:
                     continue
 
-                line = compute_pooh(values, labels)
+                if len(values) < width:
+                    continue
+
+                line = compute_pooh(pick(values))
                 if not line:
                     continue
 
@@ -344,85 +419,91 @@ def get_boxscore_players(event_id: str) -> List[dict]:
 # ----------------------------
 # OUTPUT HELPERS
 # ----------------------------
-def autosize_columns(ws):
-    for col in range(1, ws.max_column + 1):
-        max_len = 0
-        col_letter = get_column_letter(col)
-        for row in range(1, ws.max_row + 1):
-            v = ws.cell(row=row, column=col).value
-            if v is None:
-                continue
-            max_len = max(max_len, len(str(v)))
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 45)
+def write_sheet(wb, title: str, headers: List[str], rows: List[list]):
+    # Streams one sheet into a write-only workbook: bold/centered header, then rows.
+    # Write-only sheets take column widths before any row, so size each column to
+    # its widest value (capped at 45) first.
+    ws = wb.create_sheet(title)
+
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, v in enumerate(row):
+            if v is not None:
+                n = len(str(v))
+                if n > widths[i]:
+                    widths[i] = n
+    for col, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = min(w + 2, 45)
+
+    header_font = Font(bold=True)
+    header_align = Alignment(horizontal="center")
+    header_cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.font = header_font
+        cell.alignment = header_align
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in rows:
+        ws.append(row)
 
 def write_xlsx(players_rows: List[dict], owner_totals_rows: List[dict], out_path: str):
-    wb = Workbook()
-    ws1 = wb.active
-    ws1.title = "Players"
+    wb = Workbook(write_only=True)
 
     headers1 = ["date","owner","started_today","player","team","game","status","pooh","pts","reb","ast","stl","blk","to","min"]
-    ws1.append(headers1)
-    for c in range(1, len(headers1) + 1):
-        ws1.cell(row=1, column=c).font = Font(bold=True)
-        ws1.cell(row=1, column=c).alignment = Alignment(horizontal="center")
-
-    for r in players_rows:
-        ws1.append([r.get(h, "") for h in headers1])
+    write_sheet(wb, "Players", headers1, [[r.get(h, "") for h in headers1] for r in players_rows])
 
-    ws2 = wb.create_sheet("OwnerTotals")
     headers2 = ["owner", "starter_pooh_total", "starters_count_so_far"]
-    ws2.append(headers2)
-    for c in range(1, len(headers2) + 1):
-        ws2.cell(row=1, column=c).font = Font(bold=True)
-        ws2.cell(row=1, column=c).alignment = Alignment(horizontal="center")
-
-    for r in owner_totals_rows:
-        ws2.append([r["owner"], r["starter_pooh_total"], r["starters_count_so_far"]])
-
-    autosize_columns(ws1)
-    autosize_columns(ws2)
+    write_sheet(wb, "OwnerTotals", headers2, [[r["owner"], r["starter_pooh_total"], r["starters_count_so_far"]] for r in owner_totals_rows])
 
     wb.save(out_path)
 
 def write_html_tables(players_rows, owner_totals_rows, out_players_html, out_owners_html, title_str):
     def esc(x):
-        return html.escape("" if x is None else str(x))
+        return ("" if x is None else str(x)).translate(HTML_ESCAPE_TABLE)
 
     players_cols = ["date","owner","started_today","player","team","game","status","pooh","pts","reb","ast","stl","blk","to","min"]
 
     # Players page
-    with open(out_players_html, "w", encoding="utf-8") as f:
-        f.write("<!doctype html><html><head><meta charset='utf-8'>")
-        f.write(f"<title>SEC Pooh Points — {esc(title_str)}</title>")
-        f.write("<style>body{font-family:Arial}table{border-collapse:collapse;font-size:14px}"
-                "th,td{border:1px solid #ccc;padding:4px 6px}th{background:#eee}"
-                ".start{font-weight:bold}</style>")
-        f.write("</head><body>")
-        f.write(f"<h2>SEC Pooh Points — {esc(title_str)}</h2>")
-        f.write("<table><thead><tr>")
-        for c in players_cols:
-            f.write(f"<th>{esc(c)}</th>")
-        f.write("</tr></thead><tbody>")
-        for r in players_rows:
-            cls = " class='start'" if r.get("started_today") == "Yes" else ""
-            f.write("<tr>")
-            for c in players_cols:
-                f.write(f"<td{cls}>{esc(r.get(c,''))}</td>")
-            f.write("</tr>")
-        f.write("</tbody></table></body></html>")
+    parts = []
+    append = parts.append
+    append("<!doctype html><html><head><meta charset='utf-8'>")
+    append(f"<title>SEC Pooh Points — {esc(title_str)}</title>")
+    append("<style>body{font-family:Arial}table{border-collapse:collapse;font-size:14px}"
+           "th,td{border:1px solid #ccc;padding:4px 6px}th{background:#eee}"
+           ".start{font-weight:bold}</style>")
+    append("</head><body>")
+    append(f"<h2>SEC Pooh Points — {esc(title_str)}</h2>")
+    append("<table><thead><tr>")
+    append("".join(f"<th>{esc(c)}</th>" for c in players_cols))
+    append("</tr></thead><tbody>")
+    for r in players_rows:
+        cls = " class='start'" if r.get("started_today") == "Yes" else ""
+        append("<tr>")
+        append("".join(f"<td{cls}>{esc(r.get(c,''))}</td>" for c in players_cols))
+        append("</tr>")
+    append("</tbody></table></body></html>")
+
+    with open(out_players_html, "wb") as f:
+        f.write("".join(parts).encode("utf-8"))
 
     # Owners page
-    with open(out_owners_html, "w", encoding="utf-8") as f:
-        f.write("<!doctype html><html><head><meta charset='utf-8'>")
-        f.write(f"<title>Owner Starters Total — {esc(title_str)}</title>")
-        f.write("<style>body{font-family:Arial}table{border-collapse:collapse;font-size:14px}"
-                "th,td{border:1px solid #ccc;padding:4px 6px}th{background:#eee}</style>")
-        f.write("</head><body>")
-        f.write(f"<h2>Owner Starters Total — {esc(title_str)}</h2>")
-        f.write("<table><thead><tr><th>Owner</th><th>Starter Pooh Total</th><th>Starters Count So Far</th></tr></thead><tbody>")
-        for r in owner_totals_rows:
-            f.write(f"<tr><td>{esc(r['owner'])}</td><td>{esc(r['starter_pooh_total'])}</td><td>{esc(r['starters_count_so_far'])}</td></tr>")
-        f.write("</tbody></table></body></html>")
+    parts = []
+    append = parts.append
+    append("<!doctype html><html><head><meta charset='utf-8'>")
+    append(f"<title>Owner Starters Total — {esc(title_str)}</title>")
+    append("<style>body{font-family:Arial}table{border-collapse:collapse;font-size:14px}"
+           "th,td{border:1px solid #ccc;padding:4px 6px}th{background:#eee}</style>")
+    append("</head><body>")
+    append(f"<h2>Owner Starters Total — {esc(title_str)}</h2>")
+    append("<table><thead><tr><th>Owner</th><th>Starter Pooh Total</th><th>Starters Count So Far</th></tr></thead><tbody>")
+    for r in owner_totals_rows:
+        append(f"<tr><td>{esc(r['owner'])}</td><td>{esc(r['starter_pooh_total'])}</td><td>{esc(r['starters_count_so_far'])}</td></tr>")
+    append("</tbody></table></body></html>")
+
+    with open(out_owners_html, "wb") as f:
+        f.write("".join(parts).encode("utf-8"))
 
 
 # ----------------------------
@@ -473,8 +554,16 @@ def main():
         print(f"--- {day_label} ({date_yyyymmdd}) ---")
         print(f"SEC events after strict date filter: {len(sec_events)}")
 
-        for e in sec_events:
-            event_id = str(e.get("id") or "")
+        event_ids = [str(e.get("id") or "") for e in sec_events]
+
+        # Boxscores are independent round-trips: fetch them concurrently, then
+        # report in scoreboard order.
+        boxscores = []
+        if event_ids:
+            with ThreadPoolExecutor(max_workers=min(BOXSCORE_WORKERS, len(event_ids))) as ex:
+                boxscores = list(ex.map(get_boxscore_players, event_ids))
+
+        for e, event_id, players in zip(sec_events, event_ids, boxscores):
             hdr = extract_event_header(e)
             home = hdr["home"]
             away = hdr["away"]
@@ -483,7 +572,6 @@ def main():
             game_label = f"{away.get('abbr','')}@{home.get('abbr','')}"
             print(f"{game_label} — {status_line} — (event {event_id})")
 
-            players = get_boxscore_players(event_id)
             if not players:
                 print("  (No boxscore player stats published yet — try again later.)\n")
                 continue
@@ -523,13 +611,15 @@ def main():
     process_day(primary_label, primary_yyyymmdd)
 
     # Sort players: Owner (draft order), then starters first, then Pooh desc
+    # Undrafted sorts last; any owner missing from the board sorts just before it.
     owner_rank = {o: i for i, o in enumerate(owner_order)}
+    owner_rank["Undrafted"] = 10_000
+    rank_get = owner_rank.get
 
     def sort_key(r):
         o = r["owner"]
-        oidx = owner_rank.get(o, 10_000 if o == "Undrafted" else 9_000)
-        starter_rank = 0 if r["started_today"] == "Yes" else 1
-        return (oidx, o, r.get("date",""), starter_rank, -int(r.get("pooh", 0)), r.get("player",""))
+        # every row is built in process_day, so all keys are present and pooh is an int
+        return (rank_get(o, 9_000), o, r["date"], r["started_today"] != "Yes", -r["pooh"], r["player"])
 
     all_rows.sort(key=sort_key)
 
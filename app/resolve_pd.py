@@ -2,6 +2,12 @@ import re
 from datetime import datetime, date, timedelta
 from openpyxl import load_workbook
 
+_RE_D8 = re.compile(r"^(\d{8})(?:\.0)?$")
+_RE_SLASH = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_RE_ISO = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+_RE_NUMERIC = re.compile(r"^(\d{6,8})(?:\.0)?$")
+_RE_YYYYMMDD = re.compile(r"\d{8}")
+
 def norm_to_mmddyyyy(v):
     if v is None:
         return None
@@ -20,21 +26,21 @@ def norm_to_mmddyyyy(v):
 
     s = str(v).strip()
 
-    m = re.match(r"^(\d{8})(?:\.0)?$", s)
+    m = _RE_D8.match(s)
     if m:
         return m.group(1)
 
-    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{4})$", s)
+    m = _RE_SLASH.match(s)
     if m:
         mo, da, yr = m.groups()
         return f"{int(mo):02d}{int(da):02d}{int(yr):04d}"
 
-    m = re.match(r"^(\d{4})-(\d{1,2})-(\d{1,2})$", s)
+    m = _RE_ISO.match(s)
     if m:
         yr, mo, da = m.groups()
         return f"{int(mo):02d}{int(da):02d}{int(yr):04d}"
 
-    m = re.match(r"^(\d{6,8})(?:\.0)?$", s)
+    m = _RE_NUMERIC.match(s)
     if m:
         return m.group(1).zfill(8)
 
@@ -42,7 +48,7 @@ def norm_to_mmddyyyy(v):
 
 def resolve_pd(xlsx_path: str, yyyymmdd: str) -> str:
     yyyymmdd = (yyyymmdd or "").strip()
-    if not re.fullmatch(r"\d{8}", yyyymmdd):
+    if not _RE_YYYYMMDD.fullmatch(yyyymmdd):
         raise SystemExit(f"ERROR: date must be YYYYMMDD (8 digits). Got: {yyyymmdd}")
 
     yyyy = yyyymmdd[0:4]
@@ -50,7 +56,8 @@ def resolve_pd(xlsx_path: str, yyyymmdd: str) -> str:
     dd   = yyyymmdd[6:8]
     target_mmddyyyy = f"{mm}{dd}{yyyy}"
 
-    wb = load_workbook(xlsx_path, data_only=True)
+    # Streaming reader: rows are parsed lazily, so the break below stops reading the sheet.
+    wb = load_workbook(xlsx_path, data_only=True, read_only=True)
     ws = wb.active
 
     found = None
@@ -61,6 +68,7 @@ def resolve_pd(xlsx_path: str, yyyymmdd: str) -> str:
         if left == target_mmddyyyy:
             found = row[1]
             break
+    wb.close()
 
     if found is None:
         raise SystemExit(